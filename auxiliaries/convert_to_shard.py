@@ -0,0 +1,13 @@
+from load import DataFromPath
+from load.run_shard import RunShard
+
+# Run from the repository root with: python -m auxiliaries.convert_to_shard
+path = "data/00_raw-data/"
+
+if __name__ == "__main__":
+    # Parse all screw runs of the raw data once (in parallel, see BaseLoader)
+    screw_runs = DataFromPath(path).get_screw_runs()
+
+    # Store them in a single binary shard that replaces the JSON files on load
+    RunShard().save(screw_runs)
+    print(f"Successfully saved {len(screw_runs)} screw runs to {RunShard().path}")
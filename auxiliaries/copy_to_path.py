@@ -1,7 +1,55 @@
 import os
+import sys
+import stat
 import json
 import shutil
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def copy_file(source_path: str, destination_path: str) -> None:
+    """
+    Copy a file and preserve its permission bits and timestamps (like shutil.copy2).
+
+    On Linux, the data is copied in kernel space using os.sendfile, avoiding the
+    buffer copies of a userspace read/write loop. Other platforms (e.g. Windows)
+    fall back to shutil.copyfileobj.
+
+    Parameters:
+    -----------
+    source_path : str
+        Path of the file to copy.
+    destination_path : str
+        Path of the copy (overwritten if it already exists).
+
+    Returns:
+    --------
+    None
+    """
+    if not sys.platform.startswith("linux"):
+        with open(source_path, "rb") as fsrc, open(destination_path, "wb") as fdst:
+            shutil.copyfileobj(fsrc, fdst)
+        shutil.copystat(source_path, destination_path)
+        return
+
+    in_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        # Stat the source only once and reuse it for the block size and metadata
+        st = os.fstat(in_fd)
+        out_fd = os.open(destination_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        try:
+            block_size = max(st.st_size, 2**20)
+            # Let the kernel copy the data until the end of the source is reached
+            while os.sendfile(out_fd, in_fd, None, block_size) > 0:
+                pass
+            os.fchmod(out_fd, stat.S_IMODE(st.st_mode))
+            os.utime(out_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+        finally:
+            os.close(out_fd)
+    finally:
+        os.close(in_fd)
+
+
 # Get name of all json files that contain the file names of the scenarios
 path_02_01 = "data/02_surface-friction-x25/file-names_01_base-line.json"
 path_02_02 = "data/02_surface-friction-x25/file-names_02_up-to-fifty.json"
@@ -32,18 +80,26 @@ for path in paths:
     # Ensure the destination folder exists, create it if necessary
     os.makedirs(destination_folder, exist_ok=True)
 
-    # Iterate through the list of files and copy them
-    for file_name in files_to_copy:
-        source_path = os.path.join(source_folder, file_name)
-        destination_path = os.path.join(destination_folder, file_name)
+    # Copy the files concurrently, mapping each future back to its file name
+    # (one device saturates at a few workers, so scenarios stay sequential)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(
+                copy_file,
+                os.path.join(source_folder, file_name),
+                os.path.join(destination_folder, file_name),
+            ): file_name
+            for file_name in files_to_copy
+        }
 
-        try:
-            # Use shutil.copy2 to preserve metadata (timestamps, etc.)
-            shutil.copy2(source_path, destination_path)
-            print(f"Successfully copied {file_name} to {destination_folder}")
-        except FileNotFoundError:
-            print(f"File {file_name} not found in {source_folder}")
-        except PermissionError:
-            print(f"Permission error while copying {file_name}")
-        except Exception as e:
-            print(f"Error copying {file_name}: {e}")
+        for future in as_completed(futures):
+            file_name = futures[future]
+            try:
+                future.result()
+                print(f"Successfully copied {file_name} to {destination_folder}")
+            except FileNotFoundError:
+                print(f"File {file_name} not found in {source_folder}")
+            except PermissionError:
+                print(f"Permission error while copying {file_name}")
+            except Exception as e:
+                print(f"Error copying {file_name}: {e}")
@@ -2,11 +2,10 @@ import os
 
 path = "data/00_raw-data/"
 
-# Get current name of all files as list
-files = os.listdir(path)
-
-# Iterate files and rename ".txt" to ".json"
-for file in files:
-    os.rename(
-        os.path.join(path, file), os.path.join(path, "".join([str(file[:-4]), ".json"]))
-    )
+# Iterate all files and rename ".txt" to ".json"
+with os.scandir(path) as entries:
+    for entry in entries:
+        # Skip files that were already renamed (or are no text files at all)
+        if not entry.name.endswith(".txt"):
+            continue
+        os.rename(entry.path, os.path.join(path, "".join([entry.name[:-4], ".json"])))
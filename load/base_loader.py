@@ -1,9 +1,50 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import cached_property, partial
 from tqdm import tqdm
-from numpy import nan, nanmean, nanvar
-from typing import List, Union, Dict
+from numpy import (
+    float16,
+    float32,
+    float64,
+    frombuffer,
+    fromiter,
+    full,
+    int8,
+    int64,
+    nan,
+    nanmean,
+    nanvar,
+    ndarray,
+)
+from typing import DefaultDict, List, NamedTuple, Optional, Tuple, Union
 
-from .screw_run import ScrewRun
+from .run_shard import RunShard
+from .screw_run import SERIES_ATTRIBUTES, ScrewRun
+
+# Names of the stacked series matrices (runs x time steps) of the loaders
+SERIES_MATRICES = (
+    "all_time_values",
+    "all_angle_values",
+    "all_torque_values",
+    "all_gradient_values",
+)
+# Names of the per-run aggregates of the series (one value per run) of the loaders
+RUN_AGGREGATES = ("max_angles", "run_lengths")
+
+
+class SeriesAggregates(NamedTuple):
+    """
+    Mean and variance of the series of all runs for each time step (see aggregate_runs).
+    """
+
+    mean_time: ndarray
+    var_time: ndarray
+    mean_angle: ndarray
+    var_angle: ndarray
+    mean_torque: ndarray
+    var_torque: ndarray
 
 
 class BaseLoader(ABC):
@@ -14,12 +55,23 @@ class BaseLoader(ABC):
     -----------
         all_runs : List[str]
             A list to store the file names of all screw runs under consideration.
+        use_cache : bool
+            Whether screw runs are loaded from (and cached to) binary .npz files.
+        max_workers : int or None
+            The number of processes to parse the screw runs with (None for one per
+            CPU, 0 or 1 to parse them serially in the current process).
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, use_cache: bool = False, max_workers: Optional[int] = None
+    ) -> None:
         """
         Initializie the DataLoader.
         """
+        # Load screw runs from binary cache files instead of parsing their JSON
+        self.use_cache: bool = use_cache
+        # Number of worker processes to parse the screw runs with
+        self.max_workers: Optional[int] = max_workers
         # List of all ids of the screw runs (e.g. ["Ch_300...json", Ch_300...json", ...])
         self.all_run_ids: List[str] = []
         # List of all screw runs, loaded from as ScrewRun objects by their run id from raw data
@@ -29,11 +81,12 @@ class BaseLoader(ABC):
         self.count_of_nok: int = 0
         self.count_of_all: int = 0
         # Dicts to track the data matrix codes (DMC) in the data set
-        self.counts_of_dmc: dict = {}  # Counts of individual DMCs
-        self.labels_of_dmc: Dict[List] = {}  # Lists of their label ("OK" vs. "NOK")
-        self.ids_of_dmc: Dict[
-            List
-        ] = {}  # List of their IDs (aka file names, e.g. "Ch_000...json")
+        # Counts of individual DMCs
+        self.counts_of_dmc: DefaultDict[str, int] = defaultdict(int)
+        # Lists of their label ("OK" vs. "NOK")
+        self.labels_of_dmc: DefaultDict[str, List[str]] = defaultdict(list)
+        # List of their IDs (aka file names, e.g. "Ch_000...json")
+        self.ids_of_dmc: DefaultDict[str, List[str]] = defaultdict(list)
         # Counter variables to track the number of runs and individual DMCs
         self.num_of_runs: int = 0
         self.num_of_dmcs: int = 0
@@ -55,25 +108,56 @@ class BaseLoader(ABC):
         self.update()
 
     def load_runs_from_ids(self):
-        self.all_runs = [
-            ScrewRun(name=run_id)
-            for run_id in tqdm(self.all_run_ids, desc="Loading screw run data")
+        # Take the runs available in the binary shard if caching is enabled
+        runs_by_id = {}
+        shard = RunShard()
+        if self.use_cache and shard.exists():
+            runs_by_id = shard.load_runs(self.all_run_ids)
+        run_ids_to_parse = [
+            run_id for run_id in self.all_run_ids if run_id not in runs_by_id
         ]
 
+        load_one = partial(_load_one, use_cache=self.use_cache)
+        with ExitStack() as stack:
+            if self.max_workers is None or self.max_workers > 1:
+                # Parse the JSON files in parallel, chunks amortize the inter-process overhead
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(max_workers=self.max_workers)
+                )
+                parsed_runs = executor.map(load_one, run_ids_to_parse, chunksize=32)
+            else:
+                # Parse the JSON files serially in the current process
+                parsed_runs = map(load_one, run_ids_to_parse)
+            runs_by_id.update(
+                zip(
+                    run_ids_to_parse,
+                    tqdm(
+                        parsed_runs,
+                        total=len(run_ids_to_parse),
+                        desc="Loading screw run data",
+                    ),
+                )
+            )
+
+        self.all_runs = [runs_by_id[run_id] for run_id in self.all_run_ids]
+
     def update(self) -> None:
         """
         Collection of methods to update all additional metrics of the screw run.
         """
-        # Update the label counts
-        self.update_label_counts()
-        # Update the data matrix code dictionaries
-        self.update_dmc_dics()
+        # Update the label counts and the data matrix code dictionaries
+        self._update_all_in_one_pass()
         # Update the number of runs
         self.update_num_of_runs()
         # Update the number of DMCs
         self.update_num_of_dmcs()
+        # Reset the stacked series matrices
+        self.update_series_values()
 
-    def update_label_counts(self) -> None:
+    def _update_all_in_one_pass(self) -> None:
+        """
+        Update the label counts and the DMC dictionaries in a single sweep over all runs.
+        """
         for screw_run in self.all_runs:
             # Update the count of "OK" and "NOK" screw runs
             if screw_run.result == "OK":
@@ -84,19 +168,14 @@ class BaseLoader(ABC):
                 raise ValueError(
                     f"Unkown label {screw_run.result} in screw run {screw_run.name}"
                 )
-        self.count_of_all = self.count_of_ok + self.count_of_nok
 
-    def update_dmc_dics(self) -> None:
-        for screw_run in self.all_runs:
             # Update the dmc dictionaries for each screw run
-            if screw_run.code not in self.counts_of_dmc.keys():
-                self.counts_of_dmc[screw_run.code] = 1
-                self.labels_of_dmc[screw_run.code] = [screw_run.result]
-                self.ids_of_dmc[screw_run.code] = [screw_run.name]
-            else:
-                self.counts_of_dmc[screw_run.code] += 1
-                self.labels_of_dmc[screw_run.code] += [screw_run.result]
-                self.ids_of_dmc[screw_run.code] += [screw_run.name]
+            self.counts_of_dmc[screw_run.code] += 1
+            self.labels_of_dmc[screw_run.code].append(screw_run.result)
+            self.ids_of_dmc[screw_run.code].append(screw_run.name)
+        self.count_of_all = self.count_of_ok + self.count_of_nok
+        # Reset the label matrix, so it is rebuilt from labels_of_dmc on access
+        self.__dict__.pop("labels_matrix", None)
 
     def update_num_of_runs(self) -> None:
         """
@@ -104,14 +183,12 @@ class BaseLoader(ABC):
         """
         num_of_run_ids = len(self.all_run_ids)
         num_of_runs = len(self.all_runs)
-        try:
-            # Double check the lengths to avoid missing runs
-            assert num_of_run_ids == num_of_runs
-            self.num_of_runs = num_of_runs
-        except AssertionError:
-            raise AssertionError(
+        # Double check the lengths to avoid missing runs
+        if num_of_run_ids != num_of_runs:
+            raise RuntimeError(
                 f"The number of run ids {num_of_run_ids} does not match the number of runs {num_of_runs}"
             )
+        self.num_of_runs = num_of_runs
 
     def update_num_of_dmcs(self) -> None:
         """
@@ -119,25 +196,126 @@ class BaseLoader(ABC):
         """
         num_of_dmcs = len(self.counts_of_dmc)
         num_of_dmcs_by_label = len(self.labels_of_dmc)
-        try:
-            # Double check the lengths to avoid missing runs
-            assert num_of_dmcs == num_of_dmcs_by_label
-            self.num_of_dmcs = num_of_dmcs
-        except AssertionError:
-            raise AssertionError(
+        # Double check the lengths to avoid missing runs
+        if num_of_dmcs != num_of_dmcs_by_label:
+            raise RuntimeError(
                 f"The number of dmc labels {num_of_dmcs_by_label} does not match the number of dmcs by count {num_of_dmcs}"
             )
+        self.num_of_dmcs = num_of_dmcs
 
-    def get_time_values(self) -> List[List[float]]:
+    def update_series_values(self) -> None:
+        """
+        Reset the stacked series matrices and the per-run aggregates, so they are
+        rebuilt from all_runs on access.
+        """
+        for name in SERIES_MATRICES + RUN_AGGREGATES:
+            self.__dict__.pop(name, None)
+
+    def quantize_series(self, dtype: type = float16) -> None:
+        """
+        Convert the stacked series matrices to a smaller float type.
+
+        Halving the bytes per value halves the memory bandwidth of every scan over all
+        runs. float16 keeps about three significant digits (e.g. an angle of 1000
+        degree has a resolution of 0.5 degree), so use it for screening only.
+        NumPy reduces float16 matrices in float16, which overflows for sums over many
+        runs, so reductions have to accumulate in a wider type (e.g. with
+        nanmean(..., dtype=float64) as in aggregate_runs).
+        Calling update_series_values() restores the float32 matrices.
+
+        Args:
+            dtype (type): The float type to store the matrices with (default is float16).
+        """
+        for name in SERIES_MATRICES:
+            setattr(self, name, getattr(self, name).astype(dtype))
+
+    @cached_property
+    def labels_matrix(self) -> Tuple[ndarray, int]:
+        """
+        Labels of all workpieces as int8 matrix (workpieces x cycles) with "OK" as 1
+        and "NOK" as -1, padded with 0 to the same even number of cycles (one run
+        per screw hole), and the maximum number of labels of a workpiece.
+        """
+        list_of_labels = list(self.labels_of_dmc.values())
+        max_length = max(map(len, list_of_labels), default=0)
+        num_of_cycles = max_length + max_length % 2
+        # Encode every label as one byte (-1 is 0xff as int8) and pad every row with
+        # zero bytes, so the matrix is read from a single contiguous buffer
+        label_bytes = {"OK": b"\x01", "NOK": b"\xff"}
+        flat_labels = b"".join(
+            b"".join(map(label_bytes.__getitem__, workpiece_labels)).ljust(
+                num_of_cycles, b"\x00"
+            )
+            for workpiece_labels in list_of_labels
+        )
+        matrix = frombuffer(flat_labels, dtype=int8).reshape(
+            len(list_of_labels), num_of_cycles
+        )
+        return matrix, max_length
+
+    # The series of all runs are stacked only on first access, so loading and
+    # analyzing just the labels never touches the (possibly memory-mapped) series
+
+    @cached_property
+    def all_time_values(self) -> ndarray:
+        """
+        Time values of all runs as NaN-padded float32 matrix (runs x time steps).
+        """
+        return self.stack_series(self.get_time_values())
+
+    @cached_property
+    def all_angle_values(self) -> ndarray:
+        """
+        Angle values of all runs as NaN-padded float32 matrix (runs x time steps).
+        """
+        return self.stack_series(self.get_angle_values())
+
+    @cached_property
+    def all_torque_values(self) -> ndarray:
+        """
+        Torque values of all runs as NaN-padded float32 matrix (runs x time steps).
+        """
+        return self.stack_series(self.get_torque_values())
+
+    @cached_property
+    def all_gradient_values(self) -> ndarray:
+        """
+        Gradient values of all runs as NaN-padded float32 matrix (runs x time steps).
+        """
+        return self.stack_series(self.get_gradient_values())
+
+    @cached_property
+    def max_angles(self) -> ndarray:
+        """
+        Maximum angle of every run as float32 array.
+        """
+        return fromiter(
+            (run.angle_values.max() for run in self.all_runs),
+            dtype=float32,
+            count=len(self.all_runs),
+        )
+
+    @cached_property
+    def run_lengths(self) -> ndarray:
+        """
+        Number of time steps of every run as int64 array.
+        """
+        return fromiter(
+            (run.time_values.size for run in self.all_runs),
+            dtype=int64,
+            count=len(self.all_runs),
+        )
+
+    def get_time_values(self) -> List[ndarray]:
         return [run.time_values for run in self.all_runs]
 
-    def get_angle_values(self) -> List[List[float]]:
+    def get_angle_values(self) -> List[ndarray]:
         return [run.angle_values for run in self.all_runs]
 
-    def get_torque_values(self) -> List[List[float]]:
+    def get_torque_values(self) -> List[ndarray]:
         return [run.torque_values for run in self.all_runs]
 
-    def get_gradient_values(self) -> List[List[float]]:
+    def get_gradient_values(self) -> List[ndarray]:
         return [run.gradient_values for run in self.all_runs]
 
     def get_run_ids(self) -> List[str]:
@@ -170,16 +348,78 @@ class BaseLoader(ABC):
         """
         return [run.result for run in self.all_runs]
 
-    def aggregate_all_series(self, list_of_series: List[List[float]]) -> List[float]:
+    def stack_series(self, list_of_series: List[ndarray]) -> ndarray:
+        """
+        Stack series of different lengths into a single matrix.
+
+        Args:
+            list_of_series (List[ndarray]): The series to stack, one per screw run.
+
+        Returns:
+            ndarray
+                A float32 matrix of shape (number of series, length of the longest
+                series), with shorter series padded by NaN values.
+        """
         # Find the length of the longest time series
-        max_len = max(map(len, list_of_series))
+        max_len = max(map(len, list_of_series), default=0)
 
         # Pad all time series with NaN values to make them equal length
-        padded_list_of_series = [
-            series + [nan] * (max_len - len(series)) for series in list_of_series
-        ]
+        stacked_series = full((len(list_of_series), max_len), nan, dtype=float32)
+        for padded_series, series in zip(stacked_series, list_of_series):
+            padded_series[: len(series)] = series
+        return stacked_series
+
+    def aggregate_runs(self) -> SeriesAggregates:
+        """
+        Aggregate the time, angle and torque series of all runs at once.
+
+        The reductions run over the stacked series matrices of the loader, so the
+        runs are not stacked again for every series. They accumulate in float64, so
+        they do not overflow for matrices quantized to float16 (see quantize_series).
+
+        Returns:
+            SeriesAggregates
+                The mean and variance of every series for each time step, ignoring
+                the NaN padding of shorter runs.
+        """
+        return SeriesAggregates(
+            nanmean(self.all_time_values, axis=0, dtype=float64),
+            nanvar(self.all_time_values, axis=0, dtype=float64),
+            nanmean(self.all_angle_values, axis=0, dtype=float64),
+            nanvar(self.all_angle_values, axis=0, dtype=float64),
+            nanmean(self.all_torque_values, axis=0, dtype=float64),
+            nanvar(self.all_torque_values, axis=0, dtype=float64),
+        )
+
+    def aggregate_all_series(self, list_of_series: List[ndarray]) -> List[ndarray]:
+        padded_list_of_series = self.stack_series(list_of_series)
 
         # Calculate  and return the mean for each time point, ignoring NaN values
         return nanmean(padded_list_of_series, axis=0), nanvar(
             padded_list_of_series, axis=0
         )
+
+
+def _load_one(run_id: str, use_cache: bool = False) -> ScrewRun:
+    """
+    Load a screw run in a worker process and flatten its series there.
+
+    Flattening the series releases the screw steps of the run, so only the flat
+    arrays (and not the step objects) are pickled back to the main process.
+
+    Parameters:
+    -----------
+    run_id : str
+        The run id (aka file name, e.g. "Ch_000...json") to load.
+    use_cache : bool, optional
+        Whether to load the screw run from its binary cache file (default is False).
+
+    Returns:
+    --------
+    ScrewRun
+        The screw run with its series flattened.
+    """
+    screw_run = ScrewRun(run_id, use_cache=use_cache)
+    for name in SERIES_ATTRIBUTES:
+        getattr(screw_run, name)
+    return screw_run
@@ -1,7 +1,8 @@
 import os
-from typing import List, Union
+from functools import lru_cache
+from typing import Optional, Tuple
 
-from .screw_run import ScrewRun
+from .screw_run import load_screw_run_dmc
 from .base_loader import BaseLoader
 
 from tqdm import tqdm
@@ -12,35 +13,61 @@ class DataFromDmc(BaseLoader):
     Load data by providing a list of DMCs.
     """
 
-    def __init__(self, dmcs_to_load) -> None:
-        super().__init__()
+    def __init__(
+        self, dmcs_to_load, use_cache: bool = False, max_workers: Optional[int] = None
+    ) -> None:
+        super().__init__(use_cache=use_cache, max_workers=max_workers)
         # Load a list of run ids that contain the provided DMCs
         self.load_run_ids(dmcs_to_load)
         # Load screw runs and update loader
         self.load_and_update()
 
     def load_run_ids(self, dmcs_to_load) -> None:
-        self.dmcs_to_load = dmcs_to_load
+        # Convert a single DMC to a list for uniform processing
+        if isinstance(dmcs_to_load, str):
+            dmcs_to_load = [dmcs_to_load]
+        # Hoist the DMCs to a frozenset for constant time membership checks per file
+        self.dmcs_to_load = frozenset(dmcs_to_load)
         ids = []
 
         path_to_raw_data: str = "data/00_raw-data/"
 
-        # Iterate files and check for dmc name in files
-        for file_name in tqdm(
-            os.listdir(path_to_raw_data),
-            desc="Loading file names by DMCs",
-        ):
-            current_run = ScrewRun(name=file_name)
-            current_dmc = current_run.get_dmc()
-
+        # Check the dmc of every file in the (cached) raw data index
+        for file_name, current_dmc in _raw_data_index(path_to_raw_data):
             if current_dmc in self.dmcs_to_load:
                 # Add to list of ids
                 ids.append(file_name)
-                # Remove from list of dmcs
-                # self.dmcs_to_load.pop(current_dmc)
 
         # Update all_run_ids
         self.all_run_ids = ids
 
         print(f"DMCs: {self.dmcs_to_load}")
         print(f"IDs: {ids}")
+
+
+@lru_cache(maxsize=1)
+def _raw_data_index(path_to_raw_data: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Scan the raw data once and get the file name and DMC of every screw run.
+
+    The index is cached for subsequent loaders, since the raw data does not change
+    during an analysis. Call _raw_data_index.cache_clear() to scan again.
+
+    Parameters:
+    -----------
+    path_to_raw_data : str
+        The path to the directory containing the JSON files.
+
+    Returns:
+    --------
+    Tuple[Tuple[str, str], ...]
+        Pairs of file name and DMC (e.g. ("Ch_000...json", "...")).
+    """
+    index = []
+    with os.scandir(path_to_raw_data) as entries:
+        for entry in tqdm(entries, desc="Loading file names by DMCs"):
+            if not entry.name.endswith(".json"):
+                continue
+            # Only the DMC is needed, so skip parsing the steps and their series
+            index.append((entry.name, load_screw_run_dmc(entry.path)))
+    return tuple(index)
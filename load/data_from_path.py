@@ -1,6 +1,6 @@
 import os
 
-from typing import List, Union
+from typing import List, Optional, Union
 
 from .base_loader import BaseLoader
 
@@ -10,7 +10,9 @@ class DataFromPath(BaseLoader):
     Class to load screw driving data by providing a path to a folder of screw runs.
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self, path: str, use_cache: bool = False, max_workers: Optional[int] = None
+    ) -> None:
         """
         Initialize DataLoaderFromPath.
 
@@ -18,12 +20,17 @@ class DataFromPath(BaseLoader):
         -----------
         path : str or List[str]
             The path or list of paths from which to load data.
+        use_cache : bool, optional
+            Whether to load the screw runs from binary cache files (default is False).
+        max_workers : int, optional
+            The number of processes to parse the screw runs with (default is None for
+            one per CPU, 0 or 1 parses them serially in the current process).
 
         Returns:
         --------
         None
         """
-        super().__init__()
+        super().__init__(use_cache=use_cache, max_workers=max_workers)
         # Load a list of run ids from the provided path or paths
         self.load_run_ids(path=path)
         # Load screw runs and update loader
@@ -46,7 +53,8 @@ class DataFromPath(BaseLoader):
         if isinstance(path, str):
             paths = [path]
         elif isinstance(path, list):
-            paths = path
+            # Drop repeated paths (keeping their order) to scan each folder only once
+            paths = list(dict.fromkeys(path))
         else:
             raise ValueError(
                 "Invalid input type for 'path'. It should be a string or a list of strings."
@@ -57,15 +65,20 @@ class DataFromPath(BaseLoader):
 
         # Iterate through each path
         for current_path in paths:
-            # Check if the current path is valid
-            if not os.path.isdir(current_path):
+            # Get all json files from the current path and append to the list
+            try:
+                with os.scandir(current_path) as entries:
+                    self.all_run_ids.extend(
+                        entry.name
+                        for entry in entries
+                        if entry.is_file(follow_symlinks=False)
+                        and entry.name.endswith(".json")
+                    )
+            except (FileNotFoundError, NotADirectoryError) as e:
+                # Check if the current path is valid
                 raise InvalidPathError(
                     f"The specified path '{current_path}' is not a directory."
-                )
-
-            # Get all json files from the current path and append to the list
-            current_runs = [f for f in os.listdir(current_path) if f.endswith(".json")]
-            self.all_run_ids.extend(current_runs)
+                ) from e
 
 
 class InvalidPathError(Exception):
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Union
 
 from .data_from_path import DataFromPath
 from .scenarios import Scenarios, InvalidScenarioError
@@ -15,7 +15,10 @@ class DataFromScenario(DataFromPath):
     """
 
     def __init__(
-        self, scenarios_to_load: Union[str, int, List[Union[str, int]]]
+        self,
+        scenarios_to_load: Union[str, int, List[Union[str, int]]],
+        use_cache: bool = False,
+        max_workers: Optional[int] = None,
     ) -> None:
         """
         Initialize DataFromScenario.
@@ -24,6 +27,11 @@ class DataFromScenario(DataFromPath):
         -----------
         scenarios_to_load : Union[str, int, List[Union[str, int]]]
             The scenario number or name, or a list of scenario numbers or names to load.
+        use_cache : bool, optional
+            Whether to load the screw runs from binary cache files (default is False).
+        max_workers : int, optional
+            The number of processes to parse the screw runs with (default is None for
+            one per CPU, 0 or 1 parses them serially in the current process).
 
         Returns:
         --------
@@ -57,4 +65,4 @@ class DataFromScenario(DataFromPath):
             raise e  # Raise the exception if an error occurs
 
         # Call the superclass constructor with the paths
-        super().__init__(path=paths)
+        super().__init__(path=paths, use_cache=use_cache, max_workers=max_workers)
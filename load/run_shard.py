@@ -0,0 +1,250 @@
+import os
+
+from typing import Dict, List
+from numpy import (
+    asarray,
+    concatenate,
+    float32,
+    iinfo,
+    int16,
+    int64,
+    load,
+    ndarray,
+    save,
+    vstack,
+    zeros,
+)
+
+from .screw_run import SERIES_ATTRIBUTES, SERIES_NAMES, ScrewRun
+
+# Scales of the series that can be stored as int16 fixed-point values in the shard,
+# i.e. a resolution of 0.01 Nm for the torque and of 0.1 degree for the angle
+FIXED_POINT_SCALES = {"torque_values": 100, "angle_values": 10}
+
+
+class RunShard:
+    """
+    Binary shard that stores many screw runs in a few flat .npy files.
+
+    Attributes:
+    -----------
+    path : str
+        The path to the directory of the shard.
+    """
+
+    def __init__(self, path: str = "data/00_raw-data-shard/") -> None:
+        """
+        Initialize RunShard.
+
+        Parameters:
+        -----------
+        path : str, optional
+            The path to the directory of the shard (default is "data/00_raw-data-shard/").
+
+        Returns:
+        --------
+        None
+        """
+        self.path: str = path
+
+    def exists(self) -> bool:
+        """
+        Check if the shard was written completely.
+
+        Returns:
+        --------
+        bool
+            True if the shard can be loaded, False otherwise.
+        """
+        # The run ids are written last, so their presence marks a complete shard,
+        # shards without modification times of the JSON files have to be rebuilt
+        return os.path.isfile(self.get_file_path("run_ids")) and os.path.isfile(
+            self.get_file_path("json_mtimes")
+        )
+
+    def save(self, screw_runs: List[ScrewRun], fixed_point: bool = False) -> None:
+        """
+        Save a list of screw runs as shard.
+
+        Parameters:
+        -----------
+        screw_runs : List[ScrewRun]
+            The screw runs to store in the shard.
+        fixed_point : bool, optional
+            Whether to store the series of FIXED_POINT_SCALES as int16 instead of
+            float32 values, which halves their size on disk and the bytes read per
+            run (default is False). Series exceeding the int16 range stay float32.
+
+        Returns:
+        --------
+        None
+        """
+        os.makedirs(self.path, exist_ok=True)
+        # Invalidate an existing shard (complete or not) before overwriting its columns
+        if os.path.isfile(self.get_file_path("run_ids")):
+            os.remove(self.get_file_path("run_ids"))
+
+        columns = {
+            "results": [run.result for run in screw_runs],
+            "dates": [run.date for run in screw_runs],
+            "codes": [run.code for run in screw_runs],
+            # Modification times of the JSON files to detect runs changed afterwards
+            "json_mtimes": asarray(
+                [os.stat(run.json_path).st_mtime_ns for run in screw_runs], dtype=int64
+            ),
+            "step_counts": asarray(
+                [len(run.get_step_names()) for run in screw_runs], dtype=int64
+            ),
+            "step_names": [name for run in screw_runs for name in run.get_step_names()],
+            "step_lengths": concatenate(
+                [zeros((0, len(SERIES_NAMES)), dtype=int64)]
+                + [run.get_step_lengths() for run in screw_runs]
+            ),
+        }
+        for column in SERIES_ATTRIBUTES:
+            columns[column] = concatenate(
+                [zeros(0, dtype=float32)] + [getattr(run, column) for run in screw_runs]
+            )
+            if fixed_point and column in FIXED_POINT_SCALES:
+                columns[column] = self.to_fixed_point(columns[column], column)
+        # Write the run ids last to mark the shard as complete
+        columns["run_ids"] = [run.name for run in screw_runs]
+
+        for column, values in columns.items():
+            save(self.get_file_path(column), asarray(values))
+
+    def load_runs(
+        self, run_ids: List[str], raw_data_path: str = "data/00_raw-data/"
+    ) -> Dict[str, ScrewRun]:
+        """
+        Load screw runs from the shard by their run ids.
+
+        Parameters:
+        -----------
+        run_ids : List[str]
+            The run ids (aka file names, e.g. "Ch_000...json") to load.
+        raw_data_path : str, optional
+            The path to the directory containing the JSON files of the runs (default
+            is "data/00_raw-data/").
+
+        Returns:
+        --------
+        Dict[str, ScrewRun]
+            The screw runs by run id. Run ids missing in the shard, or whose JSON file
+            was modified (or removed) since the shard was saved, are left out.
+        """
+        index_of_run = {
+            run_id: index
+            for index, run_id in enumerate(load(self.get_file_path("run_ids")).tolist())
+        }
+        results = load(self.get_file_path("results"))
+        dates = load(self.get_file_path("dates"))
+        codes = load(self.get_file_path("codes"))
+        json_mtimes = load(self.get_file_path("json_mtimes"))
+        step_names = load(self.get_file_path("step_names"))
+        step_lengths = load(self.get_file_path("step_lengths"))
+        # Memory-map the series, so the OS only reads the pages of the selected runs
+        all_series = [
+            load(self.get_file_path(column), mmap_mode="r")
+            for column in SERIES_ATTRIBUTES
+        ]
+
+        # Offsets of the first step of each run and of the values of each step
+        step_counts = load(self.get_file_path("step_counts"))
+        step_offsets = concatenate([[0], step_counts.cumsum()])
+        value_offsets = vstack(
+            [zeros((1, len(SERIES_NAMES)), dtype=int64), step_lengths.cumsum(axis=0)]
+        )
+
+        screw_runs = {}
+        for run_id in run_ids:
+            index = index_of_run.get(run_id)
+            if index is None:
+                continue
+            # Leave out runs changed since the shard was saved, so they are parsed again
+            json_path = os.path.join(raw_data_path, run_id)
+            try:
+                if os.stat(json_path).st_mtime_ns != json_mtimes[index]:
+                    continue
+            except FileNotFoundError:
+                continue
+            first_step, end_step = step_offsets[index], step_offsets[index + 1]
+            first_values = value_offsets[first_step]
+            end_values = value_offsets[end_step]
+            screw_runs[run_id] = ScrewRun.from_arrays(
+                run_id,
+                str(results[index]),
+                str(dates[index]),
+                str(codes[index]),
+                step_names[first_step:end_step],
+                step_lengths[first_step:end_step],
+                *[
+                    self.from_fixed_point(series[first:end], column)
+                    for column, series, first, end in zip(
+                        SERIES_ATTRIBUTES, all_series, first_values, end_values
+                    )
+                ],
+                path=raw_data_path,
+            )
+        return screw_runs
+
+    def to_fixed_point(self, values: ndarray, column: str) -> ndarray:
+        """
+        Convert a series to int16 fixed-point values, if they fit into its range.
+
+        Parameters:
+        -----------
+        values : ndarray
+            The float32 values of the series.
+        column : str
+            The name of the series (see FIXED_POINT_SCALES).
+
+        Returns:
+        --------
+        ndarray
+            The scaled and rounded int16 values, or the float32 values if they
+            exceed the int16 range.
+        """
+        scaled_values = (values * FIXED_POINT_SCALES[column]).round()
+        if scaled_values.size and (
+            scaled_values.min() < iinfo(int16).min
+            or scaled_values.max() > iinfo(int16).max
+        ):
+            return values
+        return scaled_values.astype(int16)
+
+    def from_fixed_point(self, values: ndarray, column: str) -> ndarray:
+        """
+        Convert a series read from the shard back to float32 values.
+
+        Parameters:
+        -----------
+        values : ndarray
+            The values of the series, either as float32 or as int16 fixed-point.
+        column : str
+            The name of the series.
+
+        Returns:
+        --------
+        ndarray
+            The float32 values of the series.
+        """
+        if values.dtype != int16:
+            return values
+        return values.astype(float32) / float32(FIXED_POINT_SCALES[column])
+
+    def get_file_path(self, column: str) -> str:
+        """
+        Get the path of the .npy file of a column of the shard.
+
+        Parameters:
+        -----------
+        column : str
+            The name of the column (e.g. "run_ids" or "torque_values").
+
+        Returns:
+        --------
+        str
+            The path to the .npy file.
+        """
+        return os.path.join(self.path, f"{column}.npy")
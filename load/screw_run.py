@@ -1,11 +1,50 @@
 import os
+import re
 import json
 
-from itertools import chain
-from typing import Union, List, Dict, Any
+from functools import cached_property
+from typing import Union, Dict, Any, List, TypedDict
+from numpy import array, array_equal, empty, float32, int64, load, ndarray, savez
+
+try:
+    # Optional: orjson parses the number-heavy series considerably faster
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: msgspec decodes only the fields used by ScrewRun and skips all others
+    import msgspec
+except ImportError:
+    msgspec = None
 
 from load.screw_step import ScrewStep
 
+# Names of the time series recorded for every screw step
+SERIES_NAMES = ("time values", "angle values", "torque values", "gradient values")
+# Attributes of ScrewRun holding the flattened series (in the order of SERIES_NAMES)
+SERIES_ATTRIBUTES = ("time_values", "angle_values", "torque_values", "gradient_values")
+
+# Schema of the JSON fields used by ScrewRun and ScrewStep, all other fields of the
+# raw data (see the documentation in set_attributes_from_json) are never read
+ScrewStepDict = TypedDict(
+    "ScrewStepDict",
+    {"name": Any, "graph": Dict[str, Any]},
+)
+ScrewRunDict = TypedDict(
+    "ScrewRunDict",
+    {
+        "result": Any,
+        "date": Any,
+        "id code": Any,
+        "tightening steps": List[ScrewStepDict],
+    },
+)
+SCREW_RUN_DECODER = msgspec.json.Decoder(ScrewRunDict) if msgspec else None
+# Schema to read only the DMC of a screw run, skipping all steps and their series
+ScrewRunDmcDict = TypedDict("ScrewRunDmcDict", {"id code": Any})
+SCREW_RUN_DMC_DECODER = msgspec.json.Decoder(ScrewRunDmcDict) if msgspec else None
+
 
 class ScrewRun:
     """
@@ -16,6 +55,8 @@ class ScrewRun:
         self,
         name: str = None,
         path: str = "data/00_raw-data/",
+        use_cache: bool = False,
+        drop_steps: bool = True,
     ):
         """
         Initialize the ScrewRun.
@@ -26,6 +67,14 @@ class ScrewRun:
             The name of the screw run (corresponding to the JSON file name).
         path : str, optional
             The path to the directory containing JSON files (default is "/data/00_raw-data").
+        use_cache : bool, optional
+            Whether to load the run from a binary .npz file next to the JSON file,
+            which is (re-)created whenever it is missing or the JSON file changed
+            (default is False).
+        drop_steps : bool, optional
+            Whether to release the values of every series from the screw steps once
+            it is flattened, and the steps after the last series if their graphs hold
+            no other series, keeping only their names and lengths (default is True).
 
         Returns:
         --------
@@ -34,9 +83,19 @@ class ScrewRun:
         # Set name and path
         self.name: str = name
         self.path: str = path
+        self.json_path: str = os.path.join(path, name)
+        self.drop_steps: bool = drop_steps
 
-        # Load data from JSON file
-        self.set_attributes_from_json()
+        # Load data from the binary cache if available, otherwise from JSON file
+        if use_cache and self.has_fresh_cache():
+            self.set_attributes_from_cache()
+        elif use_cache:
+            # Stat the JSON file before parsing it, so any later change is detected
+            json_stat = self.get_json_stat()
+            self.set_attributes_from_json()
+            self.save_cache(json_stat)
+        else:
+            self.set_attributes_from_json()
 
     def set_attributes_from_json(self):
         """
@@ -55,15 +114,9 @@ class ScrewRun:
         self.date = str(json_dict["date"])
         # Identifier code that corresponds to the workpiece data matrix code (DMC)
         self.code = str(json_dict["id code"])
-        # Get screw steps as list of ScrewStrep
+        # Get screw steps as list of ScrewStrep (flattened to time series on access)
         self.screw_steps = [ScrewStep(step) for step in json_dict["tightening steps"]]
 
-        # Get time series data of all steps of the screw run
-        self.time_values = self.get_run_values("time values")
-        self.angle_values = self.get_run_values("angle values")
-        self.torque_values = self.get_run_values("torque values")
-        self.gradient_values = self.get_run_values("gradient values")
-
         # For sake of documentation, the remaining attributes:
         if False:
             # Format of the data
@@ -159,6 +212,246 @@ class ScrewRun:
             # Torque credibility value
             self.torque_cred = str(json_dict["Torque Cred"])
 
+    @classmethod
+    def from_arrays(
+        cls,
+        name: str,
+        result: str,
+        date: str,
+        code: str,
+        step_names: ndarray,
+        step_lengths: ndarray,
+        time_values: ndarray,
+        angle_values: ndarray,
+        torque_values: ndarray,
+        gradient_values: ndarray,
+        path: str = "data/00_raw-data/",
+    ) -> "ScrewRun":
+        """
+        Create a ScrewRun from already parsed data (e.g. from a binary cache) without
+        reading its JSON file.
+
+        Parameters:
+        -----------
+        name : str
+            The name of the screw run (corresponding to the JSON file name).
+        result, date, code : str
+            The result label, date and data matrix code of the screw run.
+        step_names : ndarray
+            The names of the screw steps.
+        step_lengths : ndarray
+            The number of values of every step (steps x series, see SERIES_NAMES).
+        time_values, angle_values, torque_values, gradient_values : ndarray
+            The flattened series of all steps.
+        path : str, optional
+            The path to the directory containing JSON files (default is "/data/00_raw-data").
+
+        Returns:
+        --------
+        ScrewRun
+            The screw run with all attributes set.
+        """
+        screw_run = cls.__new__(cls)
+        screw_run.name = name
+        screw_run.path = path
+        screw_run.json_path = os.path.join(path, name)
+        screw_run.drop_steps = True
+        screw_run.set_attributes_from_arrays(
+            result,
+            date,
+            code,
+            step_names,
+            step_lengths,
+            time_values,
+            angle_values,
+            torque_values,
+            gradient_values,
+        )
+        return screw_run
+
+    def set_attributes_from_cache(self) -> None:
+        """
+        Load data from the binary cache file instead of parsing the JSON file.
+
+        Returns:
+        --------
+        None
+        """
+        with load(self.get_cache_path()) as cache:
+            self.set_attributes_from_arrays(
+                str(cache["result"]),
+                str(cache["date"]),
+                str(cache["code"]),
+                cache["step_names"],
+                cache["step_lengths"],
+                cache["time_values"],
+                cache["angle_values"],
+                cache["torque_values"],
+                cache["gradient_values"],
+            )
+
+    def set_attributes_from_arrays(
+        self,
+        result: str,
+        date: str,
+        code: str,
+        step_names: ndarray,
+        step_lengths: ndarray,
+        time_values: ndarray,
+        angle_values: ndarray,
+        torque_values: ndarray,
+        gradient_values: ndarray,
+    ) -> None:
+        """
+        Set the attributes from already parsed data (see from_arrays).
+
+        Returns:
+        --------
+        None
+        """
+        self.result = result
+        self.date = date
+        self.code = code
+        self.time_values = time_values
+        self.angle_values = angle_values
+        self.torque_values = torque_values
+        self.gradient_values = gradient_values
+
+        # The series are already flat, so only keep the names and lengths of the steps
+        if self.drop_steps:
+            self._step_names = [str(step_name) for step_name in step_names]
+            self._step_lengths = step_lengths
+            self.screw_steps = None
+            return
+
+        # Rebuild the screw steps with views on the flattened series
+        all_series = (
+            self.time_values,
+            self.angle_values,
+            self.torque_values,
+            self.gradient_values,
+        )
+        step_ends = step_lengths.cumsum(axis=0)
+        self.screw_steps = []
+        for step_name, lengths, ends in zip(step_names, step_lengths, step_ends):
+            graph = {
+                value: series[end - length : end]
+                for value, series, length, end in zip(
+                    SERIES_NAMES, all_series, lengths, ends
+                )
+            }
+            self.screw_steps.append(ScrewStep({"name": str(step_name), "graph": graph}))
+
+    def save_cache(self, json_stat: ndarray) -> None:
+        """
+        Save the loaded data as binary cache file next to the JSON file.
+
+        Parameters:
+        -----------
+        json_stat : ndarray
+            The modification time and size of the parsed JSON file (see get_json_stat).
+
+        Returns:
+        --------
+        None
+        """
+        # Get the step data first, as flattening the series may release the steps
+        step_names = self.get_step_names()
+        step_lengths = self.get_step_lengths()
+
+        # Write to a temporary file first, so no partial cache is ever read
+        cache_path = self.get_cache_path()
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            savez(
+                cache_file,
+                result=self.result,
+                date=self.date,
+                code=self.code,
+                json_stat=json_stat,
+                step_names=step_names,
+                step_lengths=step_lengths,
+                time_values=self.time_values,
+                angle_values=self.angle_values,
+                torque_values=self.torque_values,
+                gradient_values=self.gradient_values,
+            )
+        os.replace(temp_path, cache_path)
+
+    def get_step_names(self) -> List[str]:
+        """
+        Get the names of the screw steps (e.g. ["Finding", "Thread forming", ...]).
+
+        Returns:
+        --------
+        List[str]
+            The name of every screw step.
+        """
+        if "_step_names" in self.__dict__:
+            return self._step_names
+        return [step.name for step in self.screw_steps]
+
+    def get_step_lengths(self) -> ndarray:
+        """
+        Get the number of values of every screw step.
+
+        Returns:
+        --------
+        ndarray
+            The number of values per step and series (steps x series, see SERIES_NAMES).
+        """
+        if "_step_lengths" in self.__dict__:
+            return self._step_lengths
+        return array(
+            [
+                [len(step.get_graph_values(value)) for value in SERIES_NAMES]
+                for step in self.screw_steps
+            ],
+            dtype=int64,
+        ).reshape(-1, len(SERIES_NAMES))
+
+    def has_fresh_cache(self) -> bool:
+        """
+        Check if the binary cache file exists and was saved from the current JSON file,
+        i.e. the modification time and size of the JSON file did not change since.
+
+        Returns:
+        --------
+        bool
+            True if the cache file can be loaded instead of the JSON file.
+        """
+        try:
+            json_stat = self.get_json_stat()
+            with load(self.get_cache_path()) as cache:
+                cached_json_stat = cache["json_stat"]
+        except (FileNotFoundError, KeyError):
+            # Caches saved without the stat of their JSON file are rebuilt as well
+            return False
+        return array_equal(cached_json_stat, json_stat)
+
+    def get_json_stat(self) -> ndarray:
+        """
+        Get the modification time (in nanoseconds) and the size of the JSON file.
+
+        Returns:
+        --------
+        ndarray
+            The modification time and size as int64 array.
+        """
+        json_stat = os.stat(self.json_path)
+        return array([json_stat.st_mtime_ns, json_stat.st_size], dtype=int64)
+
+    def get_cache_path(self) -> str:
+        """
+        Get the path of the binary cache file (e.g. "Ch_000...npz" for "Ch_000...json").
+
+        Returns:
+        --------
+        str
+            The path to the cache file next to the JSON file.
+        """
+        return os.path.join(self.path, f"{os.path.splitext(self.name)[0]}.npz")
+
     def get_json_as_dict(self) -> Union[Dict[str, Any], None]:
         """
         Load JSON data from the specified file.
@@ -168,25 +461,235 @@ class ScrewRun:
         Union[Dict[str, Any], None]:
             A dictionary containing the JSON data if successful, None otherwise.
         """
-        json_file_path = os.path.join(self.path, self.name)
-        try:
-            with open(json_file_path, "r") as json_file:
-                return json.load(json_file)
-        except FileNotFoundError as e:
-            raise FileNotFoundError(
-                f"Error: File '{json_file_path}' not found.",
-            ) from e
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(
-                f"Error decoding JSON file '{json_file_path}': {e}",
-            ) from e
+        return load_screw_run_dict(self.json_path)
 
     def get_dmc(self) -> str:
         return self.code
 
-    def get_run_values(self, value: str) -> List[float]:
-        return list(
-            chain.from_iterable(
-                step.get_graph_values(value) for step in self.screw_steps
+    # The four series are flattened from the screw steps only on first access
+
+    @cached_property
+    def time_values(self) -> ndarray:
+        return self.flatten_run_values("time values")
+
+    @cached_property
+    def angle_values(self) -> ndarray:
+        return self.flatten_run_values("angle values")
+
+    @cached_property
+    def torque_values(self) -> ndarray:
+        return self.flatten_run_values("torque values")
+
+    @cached_property
+    def gradient_values(self) -> ndarray:
+        return self.flatten_run_values("gradient values")
+
+    def flatten_run_values(self, value: str) -> ndarray:
+        """
+        Flatten a series of all steps and release its values from the steps.
+
+        Parameters:
+        -----------
+        value : str
+            The name of the series (see SERIES_NAMES).
+
+        Returns:
+        --------
+        ndarray
+            The values of the series of all steps.
+        """
+        run_values = self.get_run_values(value)
+        if self.drop_steps:
+            self.release_step_values(value)
+        return run_values
+
+    def release_step_values(self, value: str) -> None:
+        """
+        Release the values of a flattened series from the screw steps, and the screw
+        steps themselves after the last series, keeping only their names and lengths.
+        Steps holding other series (e.g. "angleRed values") are kept for those.
+
+        Parameters:
+        -----------
+        value : str
+            The name of the flattened series (see SERIES_NAMES).
+
+        Returns:
+        --------
+        None
+        """
+        # Keep the names and lengths before the first series is released
+        if "_step_lengths" not in self.__dict__:
+            self._step_names = self.get_step_names()
+            self._step_lengths = self.get_step_lengths()
+        # Drop the parsed values right away, so the boxed floats of a series do not
+        # stay in memory next to the arrays of the series flattened after it
+        for step in self.screw_steps:
+            del step.graph[value]
+        # Once the other three series are cached, the steps are only needed for the
+        # remaining series of their graphs (if any)
+        flattened = [name for name in SERIES_ATTRIBUTES if name in self.__dict__]
+        if len(flattened) == len(SERIES_ATTRIBUTES) - 1 and not any(
+            step.graph for step in self.screw_steps
+        ):
+            self.screw_steps = None
+
+    def get_run_values(self, value: str) -> ndarray:
+        # Series already flattened (and possibly released from the steps) are cached
+        if value in SERIES_NAMES:
+            attribute = SERIES_ATTRIBUTES[SERIES_NAMES.index(value)]
+            if attribute in self.__dict__:
+                return self.__dict__[attribute]
+        if self.screw_steps is None:
+            raise KeyError(
+                f"Series '{value}' of screw run '{self.name}' is not available, since "
+                "its screw steps were released (use drop_steps=False to keep them)"
             )
-        )
+        graphs = [step.get_graph_values(value) for step in self.screw_steps]
+        # Allocate the array once and copy the values of every step into its slice
+        run_values = empty(sum(map(len, graphs)), dtype=float32)
+        offset = 0
+        for graph in graphs:
+            run_values[offset : offset + len(graph)] = graph
+            offset += len(graph)
+        return run_values
+
+
+def read_json_bytes(json_file_path: str) -> bytes:
+    """
+    Read the raw bytes of the JSON file of a screw run.
+
+    Parameters:
+    -----------
+    json_file_path : str
+        The path to the JSON file of the screw run.
+
+    Returns:
+    --------
+    bytes
+        The content of the JSON file.
+    """
+    try:
+        # Read the bytes unbuffered, since the file is read in a single call anyway
+        with open(json_file_path, "rb", buffering=0) as json_file:
+            return json_file.read()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(
+            f"Error: File '{json_file_path}' not found.",
+        ) from e
+
+
+def load_json_as_dict(json_file_path: str) -> Dict[str, Any]:
+    """
+    Load the raw JSON data of a screw run as dict.
+
+    Parameters:
+    -----------
+    json_file_path : str
+        The path to the JSON file of the screw run.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        A dictionary containing the JSON data.
+    """
+    json_bytes = read_json_bytes(json_file_path)
+    try:
+        if orjson is not None:
+            return orjson.loads(json_bytes)
+        return json.loads(json_bytes)
+    except json.JSONDecodeError as e:
+        # Also catches orjson.JSONDecodeError, which is a subclass of it
+        raise json.JSONDecodeError(
+            f"Error decoding JSON file '{json_file_path}': {e.msg}", e.doc, e.pos
+        ) from e
+
+
+def load_screw_run_dict(json_file_path: str) -> Dict[str, Any]:
+    """
+    Load the fields of a screw run that are used by ScrewRun (see ScrewRunDict).
+
+    If msgspec is installed, all other fields are skipped while parsing, so no Python
+    objects are created for them. Otherwise, the full JSON data is loaded.
+
+    Parameters:
+    -----------
+    json_file_path : str
+        The path to the JSON file of the screw run.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        A dictionary containing (at least) the fields of ScrewRunDict.
+    """
+    return decode_screw_run_file(json_file_path, SCREW_RUN_DECODER)
+
+
+def load_screw_run_dmc(json_file_path: str) -> str:
+    """
+    Load only the data matrix code (DMC) of a screw run.
+
+    If msgspec is installed, the tightening steps and all other fields are skipped
+    while parsing. Otherwise, the full JSON data is loaded.
+
+    Parameters:
+    -----------
+    json_file_path : str
+        The path to the JSON file of the screw run.
+
+    Returns:
+    --------
+    str
+        The DMC of the screw run (aka the "id code" of its JSON data).
+    """
+    return str(decode_screw_run_file(json_file_path, SCREW_RUN_DMC_DECODER)["id code"])
+
+
+def decode_screw_run_file(json_file_path: str, decoder: Any) -> Dict[str, Any]:
+    """
+    Decode the JSON file of a screw run with a msgspec decoder of a schema.
+
+    Parameters:
+    -----------
+    json_file_path : str
+        The path to the JSON file of the screw run.
+    decoder : msgspec.json.Decoder or None
+        The decoder of the schema, or None to load the full JSON data (if msgspec
+        is not installed).
+
+    Returns:
+    --------
+    Dict[str, Any]
+        A dictionary containing (at least) the fields of the schema.
+    """
+    if decoder is None:
+        return load_json_as_dict(json_file_path)
+    json_bytes = read_json_bytes(json_file_path)
+    try:
+        return decoder.decode(json_bytes)
+    except msgspec.ValidationError as e:
+        # Well-formed JSON that does not match the schema, e.g. a missing field
+        missing_field = re.search(r"missing required field `([^`]+)`", str(e))
+        if missing_field:
+            raise KeyError(
+                f"Missing field '{missing_field.group(1)}' in JSON file '{json_file_path}'"
+            ) from e
+        raise ValueError(f"Invalid field in JSON file '{json_file_path}': {e}") from e
+    except msgspec.DecodeError as e:
+        # Raise the same error as json and orjson for malformed JSON, msgspec reports
+        # the position only in its message (e.g. "JSON is malformed: ... (byte 12)")
+        json_doc = json_bytes.decode("utf-8", errors="replace")
+        position = re.search(r"\(byte (\d+)\)", str(e))
+        if position:
+            # Convert the byte offset to the character offset of the decoded document
+            json_pos = len(
+                json_bytes[: int(position.group(1))].decode("utf-8", errors="replace")
+            )
+        elif "truncated" in str(e):
+            # Truncated input ends unexpectedly at the end of the data
+            json_pos = len(json_doc)
+        else:
+            raise ValueError(f"Error decoding JSON file '{json_file_path}': {e}") from e
+        raise json.JSONDecodeError(
+            f"Error decoding JSON file '{json_file_path}': {e}", json_doc, json_pos
+        ) from e
@@ -2,6 +2,9 @@ from typing import List, Dict, Union, Any
 
 
 class ScrewStep:
+    # Only name and graph are stored, so the steps need no per-instance __dict__
+    __slots__ = ("name", "graph")
+
     def __init__(self, step_dict: Dict[str, Any]) -> None:
         """
         Initialize a ScrewStep object.
@@ -36,32 +39,7 @@ class ScrewStep:
         # Name of the step ["Finding", "Thread forming", "Pre-tightening", "Tightening 1.4"]
         self.name: str = str(step_dict["name"])
         # Values of the screw run, such as angle, torque gradient or time
-        self.graph: List[Union[int, float]] = dict(step_dict["graph"])
-
-        # For sake of documentation, the remaining attributes:
-        if False:
-            # Type of tightening step
-            self.step_type = str(step_dict["step type"])  # "standard"
-            # Row number
-            self.row = int(step_dict["row"])
-            # Column letter
-            self.column = str(step_dict["column"])
-            # Last command executed
-            self.last_cmd = str(step_dict["last cmd"])
-            # Quality code
-            self.quality_code = str(step_dict["quality code"])  # "1"
-            # Tightening speed
-            self.speed = int(step_dict["speed"])
-            # Category of the step
-            self.category = int(step_dict["category"])  # "0"
-            # Documentation buffer
-            self.docu_buffer = int(step_dict["docu buffer"])  # "0"
-            # Result of the tightening step
-            self.result = str(step_dict["result"])
-            # Angle threshold information
-            self.angle_threshold = dict(step_dict["angle threshold"])
-            # List with dicts of tightening functions
-            self.tightening_functions = list(step_dict["tightening functions"])
+        self.graph: Dict[str, List[Union[int, float]]] = step_dict["graph"]
 
     def get_graph_values(self, value_type: str) -> List[Union[int, float]]:
         """
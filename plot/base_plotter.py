@@ -1,4 +1,6 @@
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from typing import Type
 
 from load.base_loader import BaseLoader
@@ -30,11 +32,19 @@ class BasePlotter:
         """
         Plot the ratio of 'OK' and 'NOK' observations with regard to the cycle number.
         """
-        max_length = max(
-            [len(label) for label in self.base_loader.labels_of_dmc.values()]
-        )
-        ratios_OK, ratios_NOK = self.calculate_ratios(max_length)
-        x_values = range(int(max_length / 2))
+        labels, _ = self.base_loader.labels_matrix
+
+        # Count the labels of all workpieces per cycle and sum up both screw holes
+        ok_per_cycle = (labels == 1).sum(axis=0)
+        nok_per_cycle = (labels == -1).sum(axis=0)
+        ok_pairs = ok_per_cycle[0::2] + ok_per_cycle[1::2]
+        nok_pairs = nok_per_cycle[0::2] + nok_per_cycle[1::2]
+
+        # Avoid the division by zero for cycles without any observations
+        total_pairs = np.maximum(ok_pairs + nok_pairs, 1)
+        ratios_OK = ok_pairs / total_pairs
+        ratios_NOK = nok_pairs / total_pairs
+        x_values = range(len(ratios_OK))
 
         plt.bar(
             x=x_values,
@@ -54,103 +64,25 @@ class BasePlotter:
         plt.title("Ratio of OK and NOK runs with regard to the cycle number")
         plt.show()
 
-    def calculate_ratios(self, max_length):
-        """
-        Calculate the ratio of 'OK' and 'NOK' for each index across the lists.
-        Args:
-            max_length (int): The maximum length of labels for a workpiece.
-        Returns:
-            Tuple: Two lists containing ratios for 'OK' and 'NOK'.
-        """
-        ratios_OK, ratios_NOK = [], []
-
-        for i in range(0, max_length, 2):
-            ok_count, nok_count = self.calculate_counts(i)
-            total_count = ok_count + nok_count
-            ratio_OK = ok_count / total_count if total_count != 0 else 0
-            ratio_NOK = nok_count / total_count if total_count != 0 else 0
-            ratios_OK.append(ratio_OK)
-            ratios_NOK.append(ratio_NOK)
-
-        return ratios_OK, ratios_NOK
-
-    def calculate_counts(self, index):
-        """
-        Calculate the number of 'OK' and 'NOK' results for one workpiece.
-        Args:
-            index (int): The index representing a screw cycle.
-        Returns:
-            Tuple: Two integers representing the counts of 'OK' and 'NOK'.
-        """
-        ok_count = sum(
-            self.base_loader.labels_of_dmc[key][index] == "OK"
-            for key in self.base_loader.labels_of_dmc
-        ) + sum(
-            self.base_loader.labels_of_dmc[key][index + 1] == "OK"
-            for key in self.base_loader.labels_of_dmc
-        )
-
-        nok_count = sum(
-            self.base_loader.labels_of_dmc[key][index] == "NOK"
-            for key in self.base_loader.labels_of_dmc
-        ) + sum(
-            self.base_loader.labels_of_dmc[key][index + 1] == "NOK"
-            for key in self.base_loader.labels_of_dmc
-        )
-
-        return ok_count, nok_count
-
     def plot_dmc_label_heatmap(self) -> None:
         """
         Plot a heatmap of 'OK' and 'NOK' observations for the first and second screw holes.
         """
-        max_length = max(
-            [len(label) for label in self.base_loader.labels_of_dmc.values()]
-        )
-        labels_even, labels_odd = self.create_heatmap_data(max_length)
+        labels, _ = self.base_loader.labels_matrix
 
         plt.subplot(1, 2, 1)
-        plt.imshow(labels_even, cmap="RdYlGn")
+        plt.imshow(labels[:, 0::2], cmap="RdYlGn")
         plt.title("First screw hole (left)")
         plt.colorbar()
 
         plt.subplot(1, 2, 2)
-        plt.imshow(labels_odd, cmap="RdYlGn")
+        plt.imshow(labels[:, 1::2], cmap="RdYlGn")
         plt.title("Second screw hole (right)")
         plt.colorbar()
 
         plt.tight_layout()
         plt.show()
 
-    def create_heatmap_data(self, max_length):
-        """
-        Create data for the heatmap visualization.
-        Args:
-            max_length (int): The maximum length of labels for a workpiece.
-        Returns:
-            Tuple: Two lists containing heatmap data for even and odd indices.
-        """
-        labels_even, labels_odd = [], []
-
-        for i in range(max_length):
-            label_even, label_odd = [], []
-
-            for list_of_labels in self.base_loader.labels_of_dmc.values():
-                if i % 2 == 0:
-                    label_even.append(1 if list_of_labels[i] == "OK" else -1)
-                else:
-                    label_odd.append(1 if list_of_labels[i] == "OK" else -1)
-
-            if i % 2 == 0:
-                labels_even.append(label_even)
-            else:
-                labels_odd.append(label_odd)
-
-        labels_even = list(map(list, zip(*labels_even)))
-        labels_odd = list(map(list, zip(*labels_odd)))
-
-        return labels_even, labels_odd
-
     def plot_hist_run_lengths(self, how: str = "count", bins: int = 25) -> None:
         """
         Plot a histogram of run lengths or maximum angles.
@@ -181,12 +113,12 @@ class BasePlotter:
         Args:
             how (str): Either "count" for run lengths or "angle" for maximum angles.
         Returns:
-            List: A list containing lengths or max angles of all screw runs.
+            np.ndarray: An array containing lengths or max angles of all screw runs.
         """
         if how == "count":
-            return [len(run.time_values) for run in self.base_loader.all_runs]
+            return self.base_loader.run_lengths
         elif how == "angle":
-            return [max(run.angle_values) for run in self.base_loader.all_runs]
+            return self.base_loader.max_angles
 
     def get_plot_labels(self, how) -> None:
         """
@@ -202,15 +134,9 @@ class BasePlotter:
             return "Histogram of max angles", "Max angle of all screw runs [degree]"
 
     def plot_avg(self):
-        mean_torque, var_torque = self.base_loader.aggregate_all_series(
-            self.base_loader.get_torque_values()
-        )
-        mean_time, var_time = self.base_loader.aggregate_all_series(
-            self.base_loader.get_time_values()
-        )
-        mean_angle, var_angle = self.base_loader.aggregate_all_series(
-            self.base_loader.get_angle_values()
-        )
+        aggregates = self.base_loader.aggregate_runs()
+        mean_angle = aggregates.mean_angle
+        mean_torque, var_torque = aggregates.mean_torque, aggregates.var_torque
 
         _, ax = plt.subplots()
         ax.fill_between(
@@ -227,19 +153,22 @@ class BasePlotter:
             "OK": "forestgreen",
             "NOK": "firebrick",
         }
-        # Iterate all screw runs loaded
-        for torques, angles, results in zip(
-            self.base_loader.get_torque_values(),
-            self.base_loader.get_angle_values(),
-            self.base_loader.get_run_results(),
-        ):
-            plt.plot(
-                angles,
-                torques,
-                color=colors[results],
-                alpha=0.5,
-                linewidth=0.5,
-            )
+        # Draw all screw runs loaded as one collection instead of one line per run
+        runs = LineCollection(
+            [
+                np.column_stack((angles, torques))
+                for angles, torques in zip(
+                    self.base_loader.get_angle_values(),
+                    self.base_loader.get_torque_values(),
+                )
+            ],
+            colors=[colors[results] for results in self.base_loader.get_run_results()],
+            alpha=0.5,
+            linewidths=0.5,
+        )
+        _, ax = plt.subplots()
+        ax.add_collection(runs)
+        ax.autoscale()
         plt.xlabel("Angle [degree]")
         plt.ylabel("Torque [in Nm]")
         plt.title("Visualization of all screw runs")